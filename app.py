@@ -11,6 +11,7 @@ from services.transactions_service import TransactionsService
 from validation import (
     validate_txn1_form,
     validate_txn2_form,
+    validate_txn2_bulk_form,
     validate_txn3_form,
 )
 
@@ -110,6 +111,7 @@ def create_app() -> Flask:
             "customers": customers,
             "txn1_inserted_record": None,
             "txn2_proof": None,
+            "txn2_bulk_proof": None,
             "txn3_proof": None,
             "reservation_table": None,
         }
@@ -186,6 +188,32 @@ def create_app() -> Flask:
 
         return redirect(url_for("index"))
 
+    @app.post("/feature2/bulk")
+    def feature2_bulk():
+        tickets, closed_at, validation_error = validate_txn2_bulk_form(request.form)
+        if validation_error:
+            flash(validation_error, "error")
+            return redirect(url_for("index"))
+
+        try:
+            result = service.run_txn2_bulk_close_maintenance_tickets(tickets, closed_at)
+            flash(
+                f"Feature 2 (bulk) OK: closed={result.count('closed')}, "
+                f"already closed={result.count('already_closed')}, "
+                f"not found={result.count('not_found')}. "
+                "Data persisted; trigger effect shown below.",
+                "success",
+            )
+            # Rendered directly (like Feature 1): per-ticket proof can exceed the session cookie size
+            ctx = _index_context("SERVICE_AREA")
+            ctx["txn2_bulk_proof"] = result.tickets
+            return render_template("index.html", **ctx)
+        except Exception as e:
+            logger.exception("Feature 2 (bulk) failed")
+            flash(_db_error_message(e), DB_ERROR_CATEGORY)
+
+        return redirect(url_for("index"))
+
     @app.post("/feature3")
     def feature3():
         customer_id, vehicle_id, start_time, status, validation_error = (
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 @dataclass
 class ReservationInput:
@@ -24,6 +24,13 @@ class Txn1Result:
     inserted_record: Optional[Dict[str, Any]] = None  # proof: row as stored in DB
 
 
+@dataclass
+class BulkCloseResult:
+    closed_rows: int
+    status_before: Dict[Tuple[int, int], Optional[str]]  # only tickets that were found
+    tickets_after: List[Dict[str, Any]]  # MaintenanceTicket rows joined with vehicle_status
+
+
 class CarSharingRepository:
     def __init__(self, database):
         self._db = database
@@ -112,6 +119,69 @@ class CarSharingRepository:
             conn.commit()
             return affected
 
+    def close_maintenance_tickets_bulk(
+        self,
+        tickets: Sequence[Tuple[int, int]],
+        closed_at: str,
+        chunk_size: int = 100,
+    ) -> BulkCloseResult:
+        """Close many (vehicle_id, ticket_no) pairs in one transaction, one UPDATE per chunk.
+
+        Each chunk first reads the tickets with SELECT ... FOR UPDATE: rowcount alone
+        cannot tell an already-closed ticket from a missing one, so the locked read is
+        what lets the caller flag both. Already-closed tickets keep their closed_at.
+        Pairs are locked in primary-key order so overlapping bulk closes cannot deadlock.
+        Tickets and trigger-updated Vehicle.status are read with one join before commit,
+        so the proof comes from the same transaction as the update.
+        """
+        pairs = sorted(dict.fromkeys(tickets))
+        status_before: Dict[Tuple[int, int], Optional[str]] = {}
+        closed_rows = 0
+        if not pairs:
+            return BulkCloseResult(closed_rows=0, status_before={}, tickets_after=[])
+        with self._db.connection() as conn:
+            try:
+                cur = conn.cursor()
+                for i in range(0, len(pairs), chunk_size):
+                    chunk = pairs[i:i + chunk_size]
+                    keys = ", ".join(["(%s,%s)"] * len(chunk))
+                    params = [v for pair in chunk for v in pair]
+                    cur.execute(
+                        f"""SELECT vehicle_id, ticket_no, status FROM MaintenanceTicket
+                            WHERE (vehicle_id, ticket_no) IN ({keys})
+                            FOR UPDATE""",
+                        params,
+                    )
+                    for vehicle_id, ticket_no, before in cur.fetchall():
+                        status_before[(vehicle_id, ticket_no)] = before
+                    cur.execute(
+                        f"""UPDATE MaintenanceTicket
+                            SET status = 'closed', closed_at = %s
+                            WHERE (vehicle_id, ticket_no) IN ({keys})
+                              AND (status != 'closed' OR status IS NULL)""",
+                        [closed_at, *params],
+                    )
+                    closed_rows += cur.rowcount
+
+                keys = ", ".join(["(%s,%s)"] * len(pairs))
+                cur = conn.cursor(dictionary=True)
+                cur.execute(
+                    f"""SELECT mt.*, v.status AS vehicle_status
+                        FROM MaintenanceTicket mt
+                        JOIN Vehicle v ON v.vehicle_id = mt.vehicle_id
+                        WHERE (mt.vehicle_id, mt.ticket_no) IN ({keys})
+                        ORDER BY mt.vehicle_id, mt.ticket_no""",
+                    [v for pair in pairs for v in pair],
+                )
+                tickets_after = cur.fetchall()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return BulkCloseResult(
+            closed_rows=closed_rows, status_before=status_before, tickets_after=tickets_after
+        )
+
     def get_maintenance_ticket(
         self, vehicle_id: int, ticket_no: int
     ) -> Optional[Dict[str, Any]]:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from repositories.carsharing_repo import (
     CarSharingRepository,
@@ -17,6 +17,24 @@ class Txn2Result:
     trigger_note: Optional[str] = None  # e.g. "Trigger executed: vehicle status set to 'available'"
 
 
+@dataclass
+class TicketCloseResult:
+    vehicle_id: int
+    ticket_no: int
+    outcome: str  # "closed", "already_closed" or "not_found"
+    ticket_after: Optional[Dict[str, Any]] = None  # proof: row as stored in DB
+    vehicle_status_after: Optional[str] = None  # trigger effect on Vehicle.status
+
+
+@dataclass
+class Txn2BulkResult:
+    maintenance_rows_affected: int
+    tickets: List[TicketCloseResult]
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for t in self.tickets if t.outcome == outcome)
+
+
 @dataclass
 class Txn3Result:
     deleted_rows: int
@@ -49,6 +67,31 @@ class TransactionsService:
             trigger_note=trigger_note,
         )
 
+    def run_txn2_bulk_close_maintenance_tickets(
+        self, tickets: Sequence[Tuple[int, int]], closed_at: str
+    ) -> Txn2BulkResult:
+        bulk = self._repo.close_maintenance_tickets_bulk(tickets, closed_at)
+        after = {(row["vehicle_id"], row["ticket_no"]): row for row in bulk.tickets_after}
+        results = []
+        for key in dict.fromkeys(tickets):
+            if key not in bulk.status_before:
+                outcome = "not_found"
+            elif str(bulk.status_before[key]).lower() == "closed":
+                outcome = "already_closed"
+            else:
+                outcome = "closed"
+            row = after.get(key)
+            results.append(
+                TicketCloseResult(
+                    vehicle_id=key[0],
+                    ticket_no=key[1],
+                    outcome=outcome,
+                    ticket_after=row,
+                    vehicle_status_after=row.get("vehicle_status") if row else None,
+                )
+            )
+        return Txn2BulkResult(maintenance_rows_affected=bulk.closed_rows, tickets=results)
+
     def run_txn3_delete_reservation(
         self, customer_id: int, vehicle_id: int, start_time: str, status: str
     ) -> Txn3Result:
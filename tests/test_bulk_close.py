@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+
+import pytest
+
+from repositories.carsharing_repo import BulkCloseResult, CarSharingRepository
+from services.transactions_service import TransactionsService
+from validation import MAX_BULK_TICKETS, validate_txn2_bulk_form
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+        self._rows = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        self._conn.executed.append((sql, list(params or [])))
+        if sql.startswith("SELECT vehicle_id, ticket_no, status"):
+            pairs = list(zip(params[::2], params[1::2]))
+            self._rows = [(v, t, self._conn.tickets[(v, t)]) for v, t in pairs if (v, t) in self._conn.tickets]
+        elif sql.startswith("UPDATE"):
+            pairs = list(zip(params[1::2], params[2::2]))
+            open_pairs = [p for p in pairs if self._conn.tickets.get(p, "closed") != "closed"]
+            for p in open_pairs:
+                self._conn.tickets[p] = "closed"
+            self.rowcount = len(open_pairs)
+        else:
+            pairs = list(zip(params[::2], params[1::2]))
+            self._rows = [
+                {"vehicle_id": v, "ticket_no": t, "status": self._conn.tickets[(v, t)],
+                 "vehicle_status": "available"}
+                for v, t in pairs if (v, t) in self._conn.tickets
+            ]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, tickets):
+        self.tickets = dict(tickets)
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, dictionary=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeDatabase:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @contextmanager
+    def connection(self):
+        yield self.conn
+
+
+def _statements(conn, prefix):
+    return [sql for sql, _ in conn.executed if sql.startswith(prefix)]
+
+
+def test_bulk_close_runs_one_select_and_update_per_chunk_and_commits_once():
+    conn = FakeConnection({(1, 1): "open", (1, 2): None, (2, 1): "closed"})
+    repo = CarSharingRepository(FakeDatabase(conn))
+    result = repo.close_maintenance_tickets_bulk(
+        [(2, 1), (1, 2), (1, 1)], "2026-01-01 18:00:00", chunk_size=2
+    )
+    assert len(_statements(conn, "SELECT vehicle_id, ticket_no, status")) == 2
+    assert len(_statements(conn, "UPDATE")) == 2
+    assert len(_statements(conn, "SELECT mt.*")) == 1
+    assert conn.commits == 1
+    assert result.closed_rows == 2
+    assert result.status_before == {(1, 1): "open", (1, 2): None, (2, 1): "closed"}
+
+
+def test_bulk_close_locks_pairs_in_key_order_and_reads_before_commit():
+    conn = FakeConnection({(1, 1): "open", (2, 1): "open"})
+    repo = CarSharingRepository(FakeDatabase(conn))
+    repo.close_maintenance_tickets_bulk([(2, 1), (1, 1), (2, 1)], "2026-01-01 18:00:00")
+    lock_sql, lock_params = conn.executed[0]
+    assert "FOR UPDATE" in lock_sql
+    assert lock_params == [1, 1, 2, 1]
+    assert conn.executed[-1][0].startswith("SELECT mt.*")
+
+
+def test_bulk_close_rolls_back_when_a_statement_fails():
+    class FailingConnection(FakeConnection):
+        def cursor(self, dictionary=False):
+            cur = FakeCursor(self)
+            if dictionary:
+                def fail(sql, params=None):
+                    raise RuntimeError("read failed")
+                cur.execute = fail
+            return cur
+
+    conn = FailingConnection({(1, 1): "open"})
+    repo = CarSharingRepository(FakeDatabase(conn))
+    with pytest.raises(RuntimeError):
+        repo.close_maintenance_tickets_bulk([(1, 1)], "2026-01-01 18:00:00")
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+
+
+class FakeRepo:
+    def __init__(self, result):
+        self.result = result
+
+    def close_maintenance_tickets_bulk(self, tickets, closed_at):
+        return self.result
+
+
+def test_service_maps_outcomes_in_input_order_without_duplicates():
+    after = [
+        {"vehicle_id": 1, "ticket_no": 1, "status": "closed", "vehicle_status": "available"},
+        {"vehicle_id": 2, "ticket_no": 2, "status": "Closed", "vehicle_status": "available"},
+    ]
+    repo = FakeRepo(BulkCloseResult(1, {(1, 1): None, (2, 2): "Closed"}, after))
+    result = TransactionsService(repo).run_txn2_bulk_close_maintenance_tickets(
+        [(3, 3), (2, 2), (1, 1), (2, 2)], "2026-01-01 18:00:00"
+    )
+    assert [(t.vehicle_id, t.ticket_no, t.outcome) for t in result.tickets] == [
+        (3, 3, "not_found"),
+        (2, 2, "already_closed"),
+        (1, 1, "closed"),
+    ]
+    assert result.tickets[0].ticket_after is None
+    assert result.tickets[2].vehicle_status_after == "available"
+    assert (result.count("closed"), result.count("already_closed"), result.count("not_found")) == (1, 1, 1)
+
+
+def test_bulk_form_parses_lines_and_semicolons():
+    tickets, closed_at, err = validate_txn2_bulk_form(
+        {"tickets": "10,1010\n 11 , 1011;12,5\n\n", "closed_at": "2026-01-01T18:30"}
+    )
+    assert err is None
+    assert tickets == [(10, 1010), (11, 1011), (12, 5)]
+    assert closed_at == "2026-01-01 18:30:00"
+
+
+def test_bulk_form_defaults_closed_at_to_now():
+    _, closed_at, err = validate_txn2_bulk_form({"tickets": "1,1"})
+    assert err is None
+    assert len(closed_at) == 19
+
+
+def test_bulk_form_reports_line_and_field_errors():
+    assert validate_txn2_bulk_form({"tickets": "1,1\n2"})[2] == "Line 2: expected vehicle_id,ticket_no."
+    assert validate_txn2_bulk_form({"tickets": "x,1"})[2] == "Line 1: Vehicle ID must be a whole number."
+    assert validate_txn2_bulk_form({"tickets": "1,0"})[2] == "Line 1: Ticket number must be a positive number."
+    assert validate_txn2_bulk_form({"tickets": "  "})[2] == "At least one vehicle_id,ticket_no pair is required."
+    assert validate_txn2_bulk_form({"tickets": "1,1", "closed_at": "tomorrow"})[2] is not None
+
+
+def test_bulk_form_caps_ticket_count():
+    lines = "\n".join(f"1,{n}" for n in range(1, MAX_BULK_TICKETS + 2))
+    assert validate_txn2_bulk_form({"tickets": lines})[2] == (
+        f"At most {MAX_BULK_TICKETS} tickets can be closed at once."
+    )
+    lines = "\n".join(f"1,{n}" for n in range(1, MAX_BULK_TICKETS + 1))
+    assert validate_txn2_bulk_form({"tickets": lines})[2] is None
@@ -0,0 +1,88 @@
+from tools.index_audit import (
+    FAIL,
+    PROBES,
+    RESERVATION_KEYS,
+    WARN,
+    ExplainedStatement,
+    IndexSpec,
+    analyze_plan,
+    is_served,
+    migration_sql,
+    unaudited_methods,
+)
+
+
+def _stmt(*rows, error=None):
+    return ExplainedStatement(method="m", sql="SELECT 1", plan=list(rows), error=error)
+
+
+def test_insert_values_row_is_not_a_full_scan():
+    row = {"select_type": "INSERT", "table": "Reservation", "type": "ALL",
+           "possible_keys": None, "rows": None, "Extra": None}
+    assert analyze_plan(_stmt(row)) == []
+
+
+def test_full_scan_without_usable_index_fails():
+    row = {"select_type": "SIMPLE", "table": "Reservation", "type": "ALL",
+           "possible_keys": None, "rows": 1200, "Extra": "Using where"}
+    assert [f.severity for f in analyze_plan(_stmt(row))] == [FAIL]
+
+
+def test_scan_with_possible_keys_or_derived_table_warns():
+    rows = [
+        {"table": "Reservation", "type": "ALL", "possible_keys": "idx_x", "rows": 5},
+        {"table": "<derived2>", "type": "ALL", "possible_keys": None, "rows": 5},
+    ]
+    assert [f.severity for f in analyze_plan(_stmt(*rows))] == [WARN, WARN]
+
+
+def test_filesort_and_temporary_warn():
+    row = {"table": "Reservation", "type": "range", "rows": 10,
+           "Extra": "Using where; Using temporary; Using filesort"}
+    messages = [(f.severity, f.message) for f in analyze_plan(_stmt(row))]
+    assert messages == [(WARN, "filesort on Reservation"), (WARN, "temporary table on Reservation")]
+
+
+def test_full_index_scan_warns():
+    row = {"select_type": "SIMPLE", "table": "MaintenanceTicket", "type": "index",
+           "possible_keys": None, "key": "PRIMARY", "rows": 800, "Extra": "Using where"}
+    findings = analyze_plan(_stmt(row))
+    assert [(f.severity, f.message) for f in findings] == [
+        (WARN, "full index scan on MaintenanceTicket via PRIMARY (rows=800)")
+    ]
+
+
+def test_explain_error_fails():
+    findings = analyze_plan(_stmt(error="Unknown column 'status' in 'where clause'"))
+    assert [f.severity for f in findings] == [FAIL]
+
+
+def test_explain_error_in_self_guarded_method_warns():
+    stmt = ExplainedStatement(method="get_customers_for_dropdown", sql="SELECT 1",
+                              error="Table 'Customer' doesn't exist")
+    assert [f.severity for f in analyze_plan(stmt)] == [WARN]
+
+
+def test_is_served_requires_leading_columns():
+    indexes = {"Reservation": [("PRIMARY", ("reservation_id",)),
+                               ("idx_keys", ("customer_id", "vehicle_id", "start_time", "status", "channel"))]}
+    assert is_served(RESERVATION_KEYS, indexes)
+    assert not is_served(IndexSpec("Reservation", "idx_v", ("vehicle_id",)), indexes)
+    assert not is_served(IndexSpec("Vehicle", "idx_v", ("vehicle_id",)), indexes)
+
+
+def test_migration_sql_is_guarded_per_index():
+    sql = migration_sql([IndexSpec("Reservation", "idx_r", ("start_time", "status"))])
+    assert "CREATE INDEX `idx_r` ON `Reservation` (`start_time`, `status`)" in sql
+    assert "TABLE_NAME = 'Reservation' AND INDEX_NAME = 'idx_r'" in sql
+    assert "'DO 0'" in sql
+    assert "EXISTS (SELECT 1 FROM information_schema.TABLES" in sql
+
+
+def test_every_repository_method_has_a_probe():
+    assert unaudited_methods() == []
+
+
+def test_unaudited_methods_reports_missing_probe(monkeypatch):
+    monkeypatch.setattr("tools.index_audit.PROBES", [p for p in PROBES if p.method != "ping"])
+    assert unaudited_methods() == ["ping"]
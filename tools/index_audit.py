@@ -0,0 +1,435 @@
+"""Index audit: EXPLAIN every statement CarSharingRepository issues.
+
+Runs each repository method against an EXPLAIN-only connection (nothing is
+executed or committed), flags full table and index scans, filesorts and temporary
+tables, and writes an idempotent migration for the indexes the queries need.
+
+Usage (against a seeded local database configured via .env):
+    python -m tools.index_audit [--strict] [--migration-out PATH]
+
+Exit code is 1 when a FAIL finding is reported (or any WARN with --strict).
+"""
+from __future__ import annotations
+import argparse
+import inspect
+import os
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from config import get_config
+from db import Database, DbSettings
+from repositories.carsharing_repo import CarSharingRepository, ReservationInput
+
+FAIL = "FAIL"
+WARN = "WARN"
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    table: str
+    name: str
+    columns: Tuple[str, ...]
+
+    def create_sql(self) -> str:
+        cols = ", ".join(f"`{c}`" for c in self.columns)
+        return f"CREATE INDEX `{self.name}` ON `{self.table}` ({cols})"
+
+
+# Indexes the repository queries rely on. Primary keys already serve several of
+# them; only specs no existing index leads with end up in the migration.
+RESERVATION_KEYS = IndexSpec(
+    "Reservation", "idx_reservation_keys",
+    ("customer_id", "vehicle_id", "start_time", "status"),
+)
+RESERVATION_START_TIME = IndexSpec(
+    "Reservation", "idx_reservation_start_time",
+    ("start_time", "customer_id", "vehicle_id", "status"),
+)
+RESERVATION_ID = IndexSpec("Reservation", "idx_reservation_id", ("reservation_id",))
+TICKET_KEYS = IndexSpec("MaintenanceTicket", "idx_ticket_keys", ("vehicle_id", "ticket_no"))
+VEHICLE_ID = IndexSpec("Vehicle", "idx_vehicle_id", ("vehicle_id",))
+CUSTOMER_ID = IndexSpec("Customer", "idx_customer_id", ("customer_id",))
+
+
+BULK_SAMPLE_SIZE = 100
+
+
+@dataclass
+class SampleParams:
+    """Representative parameters, taken from the seeded database where possible."""
+    zone_type: str = "SERVICE_AREA"
+    reservation_id: int = 1
+    customer_id: int = 1
+    vehicle_id: int = 1
+    start_time: str = "2026-01-01 09:00:00"
+    status: str = "confirmed"
+    ticket_vehicle_id: int = 1
+    ticket_no: int = 1
+    tickets: List[Tuple[int, int]] = field(default_factory=lambda: [(1, 1), (1, 2), (2, 1)])
+    closed_at: str = "2026-01-01 18:00:00"
+
+
+@dataclass
+class Probe:
+    method: str
+    call: Callable[[CarSharingRepository, SampleParams], Any]
+    needs: Sequence[IndexSpec] = ()
+
+
+def _sample_reservation(s: SampleParams) -> ReservationInput:
+    return ReservationInput(
+        customer_id=s.customer_id,
+        vehicle_id=s.vehicle_id,
+        start_time=s.start_time,
+        end_time=None,
+        status=s.status,
+        placed_time=s.start_time,
+        channel="app",
+        promo_code=None,
+        assigned_at=None,
+        pickup_condition=None,
+        pickup_odometer=None,
+    )
+
+
+PROBES: List[Probe] = [
+    Probe("select_latest_locations_by_zone_type",
+          lambda r, s: r.select_latest_locations_by_zone_type(s.zone_type)),
+    Probe("select_all_reservations", lambda r, s: r.select_all_reservations(),
+          (RESERVATION_ID,)),
+    Probe("get_distinct_zone_types", lambda r, s: r.get_distinct_zone_types()),
+    Probe("run_txn1_view_and_insert",
+          lambda r, s: r.run_txn1_view_and_insert(s.zone_type, _sample_reservation(s)),
+          (RESERVATION_ID,)),
+    Probe("get_reservation_by_id", lambda r, s: r.get_reservation_by_id(s.reservation_id),
+          (RESERVATION_ID,)),
+    Probe("close_maintenance_ticket",
+          lambda r, s: r.close_maintenance_ticket(s.ticket_vehicle_id, s.ticket_no, s.closed_at),
+          (TICKET_KEYS,)),
+    Probe("close_maintenance_tickets_bulk",
+          lambda r, s: r.close_maintenance_tickets_bulk(s.tickets, s.closed_at),
+          (TICKET_KEYS, VEHICLE_ID)),
+    Probe("get_maintenance_ticket",
+          lambda r, s: r.get_maintenance_ticket(s.ticket_vehicle_id, s.ticket_no),
+          (TICKET_KEYS,)),
+    Probe("get_reservation_by_keys",
+          lambda r, s: r.get_reservation_by_keys(s.customer_id, s.vehicle_id, s.start_time, s.status),
+          (RESERVATION_KEYS,)),
+    Probe("reservation_exists",
+          lambda r, s: r.reservation_exists(s.customer_id, s.vehicle_id, s.start_time, s.status),
+          (RESERVATION_KEYS,)),
+    Probe("get_vehicle_status", lambda r, s: r.get_vehicle_status(s.vehicle_id),
+          (VEHICLE_ID,)),
+    # Walks the (vehicle_id, ticket_no) key in ORDER BY order and filters on
+    # status until LIMIT is reached; a status-leading index would add a filesort.
+    Probe("get_open_maintenance_tickets", lambda r, s: r.get_open_maintenance_tickets(),
+          (TICKET_KEYS,)),
+    Probe("get_reservations_for_dropdown", lambda r, s: r.get_reservations_for_dropdown(),
+          (RESERVATION_START_TIME,)),
+    Probe("get_customers_for_dropdown", lambda r, s: r.get_customers_for_dropdown(),
+          (CUSTOMER_ID,)),
+    Probe("delete_reservation",
+          lambda r, s: r.delete_reservation(s.customer_id, s.vehicle_id, s.start_time, s.status),
+          (RESERVATION_KEYS,)),
+    Probe("ping", lambda r, s: r.ping()),
+]
+
+# Probes whose repository method swallows its own errors, so they may legitimately
+# record no statement or a failed EXPLAIN (e.g. no Customer table); reported as WARN.
+SELF_GUARDED = {"ping", "get_customers_for_dropdown"}
+
+
+@dataclass
+class ExplainedStatement:
+    method: str
+    sql: str
+    plan: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class _ExplainCursor:
+    """Cursor stand-in: runs EXPLAIN instead of the statement, returns no rows."""
+
+    def __init__(self, conn, recorder: List[ExplainedStatement], method: str):
+        self._conn = conn
+        self._recorder = recorder
+        self._method = method
+        self.rowcount = 0
+        self.lastrowid = 0
+
+    def execute(self, sql: str, params=None):
+        sql = " ".join(sql.split()).rstrip(";")
+        entry = ExplainedStatement(method=self._method, sql=sql)
+        self._recorder.append(entry)
+        cur = self._conn.cursor(dictionary=True)
+        try:
+            cur.execute("EXPLAIN " + sql, params)
+            entry.plan = cur.fetchall()
+        except Exception as e:
+            entry.error = str(e) or repr(e)
+            raise
+        finally:
+            cur.close()
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class _ExplainConnection:
+    def __init__(self, conn, recorder: List[ExplainedStatement], method: str):
+        self._conn = conn
+        self._recorder = recorder
+        self._method = method
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainCursor(self._conn, self._recorder, self._method)
+
+    def commit(self):
+        # EXPLAIN never writes, but never commit on behalf of an audited method.
+        self._conn.rollback()
+
+    def rollback(self):
+        self._conn.rollback()
+
+
+class ExplainDatabase:
+    """Database stand-in whose connections EXPLAIN every statement they receive."""
+
+    def __init__(self, database: Database):
+        self._db = database
+        self.statements: List[ExplainedStatement] = []
+        self.method = ""
+
+    @contextmanager
+    def connection(self):
+        with self._db.connection() as conn:
+            try:
+                yield _ExplainConnection(conn, self.statements, self.method)
+            finally:
+                conn.rollback()
+
+
+@dataclass
+class Finding:
+    severity: str
+    method: str
+    message: str
+    sql: str
+
+
+def sample_params(repo: CarSharingRepository) -> SampleParams:
+    """Pick real keys from the seeded database so plans reflect actual data."""
+    s = SampleParams()
+    zone_types = repo.get_distinct_zone_types()
+    if zone_types:
+        s.zone_type = zone_types[0]
+    reservations = repo.select_all_reservations(limit=1)
+    if reservations:
+        row = reservations[0]
+        s.reservation_id = row["reservation_id"]
+        s.customer_id = row["customer_id"]
+        s.vehicle_id = row["vehicle_id"]
+        s.start_time = str(row["start_time"])
+        s.status = row["status"]
+    tickets = repo.get_open_maintenance_tickets()
+    if tickets:
+        s.ticket_vehicle_id = tickets[0]["vehicle_id"]
+        s.ticket_no = tickets[0]["ticket_no"]
+        # A full bulk-close chunk, so EXPLAIN sees the multi-pair IN list
+        s.tickets = [(t["vehicle_id"], t["ticket_no"]) for t in tickets[:BULK_SAMPLE_SIZE]]
+    return s
+
+
+def existing_tables(database: Database) -> Set[str]:
+    """Names of the tables and views in the current schema."""
+    sql = """SELECT TABLE_NAME FROM information_schema.TABLES
+             WHERE TABLE_SCHEMA = DATABASE();"""
+    with database.connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql)
+        return {row[0] for row in cur.fetchall()}
+
+
+def existing_indexes(database: Database) -> Dict[str, List[Tuple[str, Tuple[str, ...]]]]:
+    """Return {table: [(index_name, columns), ...]} for the current schema."""
+    sql = """SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME
+             FROM information_schema.STATISTICS
+             WHERE TABLE_SCHEMA = DATABASE()
+             ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX;"""
+    grouped: Dict[Tuple[str, str], List[str]] = {}
+    with database.connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql)
+        for table, index_name, column in cur.fetchall():
+            grouped.setdefault((table, index_name), []).append(column)
+    result: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+    for (table, index_name), columns in grouped.items():
+        result.setdefault(table, []).append((index_name, tuple(columns)))
+    return result
+
+
+def is_served(spec: IndexSpec, indexes: Dict[str, List[Tuple[str, Tuple[str, ...]]]]) -> bool:
+    """True if an existing index has spec.columns as its leading columns."""
+    n = len(spec.columns)
+    return any(cols[:n] == spec.columns for _, cols in indexes.get(spec.table, []))
+
+
+def analyze_plan(stmt: ExplainedStatement) -> List[Finding]:
+    if stmt.error:
+        severity = WARN if stmt.method in SELF_GUARDED else FAIL
+        return [Finding(severity, stmt.method, f"EXPLAIN failed: {stmt.error}", stmt.sql)]
+    findings = []
+    for row in stmt.plan:
+        table = row.get("table") or ""
+        extra = row.get("Extra") or ""
+        if row.get("rows") is None or row.get("select_type") == "INSERT":
+            # EXPLAIN INSERT ... VALUES reports type=ALL without reading any rows
+            continue
+        if row.get("type") == "ALL":
+            # Derived tables (views) and scans the optimizer chose over an
+            # available index are worth a look but do not gate on their own.
+            derived = table.startswith("<")
+            severity = WARN if derived or row.get("possible_keys") else FAIL
+            findings.append(Finding(
+                severity, stmt.method,
+                f"full table scan on {table} (rows={row.get('rows')}, "
+                f"possible_keys={row.get('possible_keys')})",
+                stmt.sql,
+            ))
+        elif row.get("type") == "index":
+            findings.append(Finding(
+                WARN, stmt.method,
+                f"full index scan on {table} via {row.get('key')} (rows={row.get('rows')})",
+                stmt.sql,
+            ))
+        if "Using filesort" in extra:
+            findings.append(Finding(WARN, stmt.method, f"filesort on {table}", stmt.sql))
+        if "Using temporary" in extra:
+            findings.append(Finding(WARN, stmt.method, f"temporary table on {table}", stmt.sql))
+    return findings
+
+
+def unaudited_methods() -> List[str]:
+    """Public repository methods that have no probe (new queries must be added to PROBES)."""
+    probed = {p.method for p in PROBES}
+    return sorted(
+        name for name, _ in inspect.getmembers(CarSharingRepository, inspect.isfunction)
+        if not name.startswith("_") and name not in probed
+    )
+
+
+def migration_sql(specs: Sequence[IndexSpec]) -> str:
+    """Idempotent MySQL migration: each CREATE INDEX runs only if its table exists
+    and the index is absent."""
+    lines = ["-- Generated by tools/index_audit.py. Safe to run repeatedly.", ""]
+    for spec in specs:
+        create = spec.create_sql().replace("'", "''")
+        lines += [
+            f"-- {spec.table}({', '.join(spec.columns)})",
+            "SET @ddl := (SELECT IF("
+            "EXISTS (SELECT 1 FROM information_schema.TABLES "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{spec.table}') "
+            "AND NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS "
+            f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = '{spec.table}' "
+            f"AND INDEX_NAME = '{spec.name}'), "
+            f"'{create}', 'DO 0'));",
+            "PREPARE stmt FROM @ddl;",
+            "EXECUTE stmt;",
+            "DEALLOCATE PREPARE stmt;",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def run_audit(database: Database) -> Tuple[List[ExplainedStatement], List[Finding], List[IndexSpec]]:
+    params = sample_params(CarSharingRepository(database))
+    explain_db = ExplainDatabase(database)
+    explain_repo = CarSharingRepository(explain_db)
+    tables = existing_tables(database)
+    probes = [p for p in PROBES if all(spec.table in tables for spec in p.needs)]
+    findings: List[Finding] = []
+    for probe in probes:
+        explain_db.method = probe.method
+        start = len(explain_db.statements)
+        try:
+            probe.call(explain_repo, params)
+        except Exception as e:
+            recorded = any(s.error for s in explain_db.statements[start:])
+            if not recorded:
+                findings.append(Finding(FAIL, probe.method, f"probe raised {e!r}", ""))
+            continue
+        if len(explain_db.statements) == start and probe.method not in SELF_GUARDED:
+            findings.append(Finding(FAIL, probe.method, "probe issued no statements", ""))
+
+    seen = set()
+    for stmt in explain_db.statements:
+        if stmt.sql in seen:
+            continue
+        seen.add(stmt.sql)
+        findings.extend(analyze_plan(stmt))
+    for name in unaudited_methods():
+        findings.append(Finding(FAIL, name, "repository method has no audit probe", ""))
+
+    indexes = existing_indexes(database)
+    missing: List[IndexSpec] = []
+    for probe in probes:
+        for spec in probe.needs:
+            if spec not in missing and not is_served(spec, indexes):
+                missing.append(spec)
+    return explain_db.statements, findings, missing
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strict", action="store_true", help="fail on warnings as well")
+    parser.add_argument("--migration-out", help="write the index migration to this file")
+    args = parser.parse_args(argv)
+
+    cfg = get_config()
+    database = Database(
+        DbSettings(
+            host=cfg.db_host,
+            port=cfg.db_port,
+            user=cfg.db_user,
+            password=cfg.db_password,
+            database=cfg.db_name,
+        ),
+        pool_name="index_audit_pool",
+        pool_size=1,
+    )
+    statements, findings, missing = run_audit(database)
+
+    print(f"Explained {len({s.sql for s in statements})} distinct statements "
+          f"from {len(PROBES)} repository methods.")
+    for f in findings:
+        print(f"[{f.severity}] {f.method}: {f.message}")
+        if f.sql:
+            print(f"       {f.sql}")
+    if missing:
+        print(f"{len(missing)} index(es) missing: " + ", ".join(s.name for s in missing))
+        sql = migration_sql(missing)
+        if args.migration_out:
+            os.makedirs(os.path.dirname(args.migration_out) or ".", exist_ok=True)
+            with open(args.migration_out, "w", encoding="utf-8") as fh:
+                fh.write(sql)
+            print(f"Migration written to {args.migration_out}")
+        else:
+            print()
+            print(sql)
+
+    failing = {FAIL, WARN} if args.strict else {FAIL}
+    if missing or any(f.severity in failing for f in findings):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 """Simple input validation for form data. Returns (value, error_message)."""
 from __future__ import annotations
 import re
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 def _norm_dt(s: str) -> str:
     """Normalize datetime from datetime-local (YYYY-MM-DDTHH:MM) to MySQL format."""
@@ -139,6 +139,40 @@ def validate_txn2_form(data) -> Tuple[Optional[int], Optional[int], str, Optiona
     return vehicle_id, ticket_no, closed_at, None
 
 
+MAX_BULK_TICKETS = 500
+
+
+def validate_txn2_bulk_form(data) -> Tuple[List[Tuple[int, int]], str, Optional[str]]:
+    """Returns (tickets, closed_at, error_message). One "vehicle_id,ticket_no" pair per line."""
+    tickets: List[Tuple[int, int]] = []
+    lines = (data.get("tickets") or "").replace(";", "\n").splitlines()
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) != 2:
+            return [], "", f"Line {line_no}: expected vehicle_id,ticket_no."
+        vehicle_id, err = validate_positive_int(parts[0], f"Line {line_no}: Vehicle ID")
+        if err:
+            return [], "", err
+        ticket_no, err = validate_positive_int(parts[1], f"Line {line_no}: Ticket number")
+        if err:
+            return [], "", err
+        tickets.append((vehicle_id, ticket_no))
+    if not tickets:
+        return [], "", "At least one vehicle_id,ticket_no pair is required."
+    if len(tickets) > MAX_BULK_TICKETS:
+        return [], "", f"At most {MAX_BULK_TICKETS} tickets can be closed at once."
+    closed_at, err = validate_datetime(data.get("closed_at"), "Closed at", required=False)
+    if err:
+        return [], "", err
+    if not closed_at:
+        from datetime import datetime
+        closed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return tickets, closed_at, None
+
+
 def validate_txn3_form(data) -> Tuple[Optional[int], Optional[int], Optional[str], str, Optional[str]]:
     """Returns (customer_id, vehicle_id, start_time, status, error_message)."""
     customer_id, err = validate_positive_int(data.get("customer_id"), "Customer ID")